@@ -2,11 +2,16 @@ import streamlit as st
 from crewai import Crew, Process
 from src.agents import create_research_agents, create_ops_agents, create_completion_agent
 from src.tasks import create_extraction_tasks, create_blueprint_task, create_refinement_task, create_execution_tasks, create_completion_task
-import os
+from src.config import MEMGRAPH_HOST, setup_logging
 from dotenv import load_dotenv
 import json
+import re
 
 load_dotenv()
+setup_logging()
+
+# Fenced ```json blocks in raw crew output (fallback parser in Step 1)
+JSON_BLOCK_RE = re.compile(r"```json(.*?)```", re.DOTALL)
 
 st.set_page_config(page_title="GearGraph Ops", layout="wide", page_icon="⚙️")
 
@@ -23,7 +28,7 @@ if 'chat_history' not in st.session_state:
 # Sidebar
 with st.sidebar:
     st.title("GearGraph Ops")
-    st.info("Connected to Memgraph @ " + os.getenv("MEMGRAPH_HOST", "Unknown"))
+    st.info("Connected to Memgraph @ " + MEMGRAPH_HOST)
     
     st.markdown("### Progress")
     if st.session_state['step'] == 'input':
@@ -95,8 +100,7 @@ if st.session_state['step'] == 'input':
                         st.error(f"Error parsing task outputs: {e}")
                         # Fallback to previous hack if direct access fails (unlikely but safe)
                         raw_result = str(result)
-                        import re
-                        json_blocks = re.findall(r"```json(.*?)```", raw_result, re.DOTALL)
+                        json_blocks = JSON_BLOCK_RE.findall(raw_result)
                         if len(json_blocks) >= 2:
                             st.session_state['extracted_data'] = json_blocks[0].strip()
                             st.session_state['extracted_insights'] = json_blocks[1].strip()
@@ -2,12 +2,14 @@ import os
 from crewai import Crew, Process
 from src.agents import create_agents
 from src.tasks import create_tasks
+from src.config import setup_logging
 
 # Configuration
 DEFAULT_DATASET_NAME = "gear_knowledge_base"
 DEFAULT_ONTOLOGY_FILE = "geargraph_ontology.ttl"
 
 def run():
+    setup_logging()
     print("## Welcome to the GearCrew ##")
     print("-------------------------------")
     print(f"Targeting Cognee Server: {os.environ.get('COGNEE_API_URL', 'Default (Local/Cloud)')}")
@@ -1,4 +1,8 @@
 import os
+import queue
+import atexit
+import logging
+from logging.handlers import QueueHandler, QueueListener
 from crewai import LLM
 from dotenv import load_dotenv
 from gqlalchemy import Memgraph
@@ -6,6 +10,35 @@ from gqlalchemy import Memgraph
 # Load environment variables
 load_dotenv()
 
+# Audit Log (alle Cypher-Ausführungen)
+LOG_FILE = "geargraph_ops.log"
+_log_listener = None
+
+def setup_logging():
+    """
+    Configures the audit log. Records are handed to a background QueueListener
+    that owns the file handler, so tools like ExecuteCypherTool never wait on disk I/O.
+    Call once from the entrypoint; repeated calls (e.g. Streamlit reruns) are no-ops.
+    """
+    global _log_listener
+    # Am Root-Logger prüfen, nicht nur am Modul-Global: Streamlit lädt geänderte
+    # Module neu, _log_listener ist dann wieder None, der alte Handler aber noch aktiv.
+    root = logging.getLogger()
+    if any(isinstance(h, QueueHandler) for h in root.handlers):
+        return
+
+    file_handler = logging.FileHandler(LOG_FILE)
+    file_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+
+    log_queue = queue.SimpleQueue()
+    root.setLevel(logging.INFO)
+    root.addHandler(QueueHandler(log_queue))
+
+    _log_listener = QueueListener(log_queue, file_handler)
+    _log_listener.start()
+    # Flush remaining records on shutdown
+    atexit.register(_log_listener.stop)
+
 # Memgraph Connection Setup
 # Wir initialisieren das hier global, damit es in den Tools wiederverwendet werden kann
 try:
@@ -1,5 +1,8 @@
 from crewai import Task
 
+# Der Profiler braucht nur einen Anriss der Quelle
+PROFILE_SNIPPET_CHARS = 1000
+
 def create_extraction_tasks(profiler, detective, hunter, source_text, source_url):
     
     # Task 1: Profiling
@@ -11,7 +14,7 @@ def create_extraction_tasks(profiler, detective, hunter, source_text, source_url
         3. Gib Anweisungen für den Detective, wie streng er prüfen muss.
         
         INPUT TEXT:
-        {source_text[:1000]}...
+        {source_text[:PROFILE_SNIPPET_CHARS]}...
         """,
         agent=profiler,
         expected_output="Ein kurzer Risiko-Bericht und Verification-Policy."
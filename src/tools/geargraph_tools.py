@@ -1,8 +1,14 @@
 import os
+import re
+import json
+import time
 import logging
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Type, List, Optional, Dict, Any
 from crewai.tools import BaseTool
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from gqlalchemy import Memgraph
 from rdflib import Graph, RDF, RDFS, OWL
 from firecrawl import FirecrawlApp
@@ -10,18 +16,76 @@ from firecrawl import FirecrawlApp
 # Importiere das Firecrawl Tool Wrapper
 from src.tools.search_tools import search_tool
 
-# Setup Logging
-logging.basicConfig(
-    filename='geargraph_ops.log',
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Audit-Logger; Handler werden vom Entrypoint über src.config.setup_logging() konfiguriert
+logger = logging.getLogger(__name__)
 
 # Memgraph Connection (aus Config)
 from src.config import memgraph
 
+# --- Caching Helper ---
+
+class _TTLCache:
+    """Small thread-safe LRU cache whose entries expire after `ttl` seconds."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+# Detective/Completer fragen dieselben Namen oft mehrfach ab.
+# Nur Treffer werden gecacht: ein "nicht gefunden" kann durch Schreibzugriffe
+# anderer Sessions/Clients jederzeit veralten und würde Duplikate erzeugen.
+# Wird zusätzlich nach jeder erfolgreichen Ausführung von ExecuteCypherTool geleert.
+_similar_nodes_cache = _TTLCache(maxsize=4096, ttl=300)
+
 # --- 1. Find Similar Nodes Tool ---
 
+_LABEL_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+SIMILAR_NODES_LIMIT = 5
+
+def _similar_nodes_query(label: str) -> str:
+    """
+    Builds the lookup query for a label already checked against _LABEL_RE.
+    Labels cannot be Cypher parameters without losing the label index scan,
+    so the label is interpolated and the name stays a parameter.
+
+    The search name is lowercased once per query with the same toLower() that is
+    applied to node names, so both sides of the comparison always agree.
+    """
+    return f"""
+        WITH toLower($name) AS q
+        MATCH (n:{label})
+        WHERE toLower(n.name) CONTAINS q
+           OR q CONTAINS toLower(n.name)
+        RETURN n.name as Name, labels(n) as Labels, n.productUrl as URL
+        LIMIT {SIMILAR_NODES_LIMIT}
+        """
+
 class FindSimilarNodesInput(BaseModel):
     name: str = Field(..., description="The name of the entity to search for.")
     label: str = Field("GearItem", description="The label to filter by (e.g. 'GearItem', 'OutdoorBrand').")
@@ -32,14 +96,16 @@ class FindSimilarNodesTool(BaseTool):
     args_schema: Type[BaseModel] = FindSimilarNodesInput
 
     def _run(self, name: str, label: str = "GearItem") -> str:
+        cache_key = (label, name)
+        cached = _similar_nodes_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        if not _LABEL_RE.match(label):
+            return f"Graph Lookup Error: Invalid label '{label}'."
+
         # Case-insensitive search via Cypher
-        query = f"""
-        MATCH (n:{label})
-        WHERE toLower(n.name) CONTAINS toLower($name) 
-           OR toLower($name) CONTAINS toLower(n.name)
-        RETURN n.name as Name, labels(n) as Labels, n.productUrl as URL
-        LIMIT 5
-        """
+        query = _similar_nodes_query(label)
         try:
             if not memgraph:
                 return "Error: No DB Connection"
@@ -47,9 +113,10 @@ class FindSimilarNodesTool(BaseTool):
             results = list(memgraph.execute_and_fetch(query, {"name": name}))
             if not results:
                 return f"No similar nodes to '{name}' found in Graph."
-            
-            import json
-            return f"SUCCESS: Found existing nodes: {json.dumps(results, default=str)}"
+
+            result = f"SUCCESS: Found existing nodes: {json.dumps(results, default=str)}"
+            _similar_nodes_cache.put(cache_key, result)
+            return result
         except Exception as e:
             return f"Graph Lookup Error: {str(e)}"
 
@@ -65,19 +132,48 @@ class ExecuteCypherTool(BaseTool):
     args_schema: Type[BaseModel] = ExecuteCypherInput
 
     def _run(self, query: str, reason: str) -> str:
-        logging.info(f"EXECUTION | Reason: {reason} | Query: {query}")
+        logger.info(f"EXECUTION | Reason: {reason} | Query: {query}")
         try:
             if not memgraph:
                 return "Error: No DB Connection"
             
             memgraph.execute(query)
+            _similar_nodes_cache.clear()
             return "Success: Query executed successfully."
         except Exception as e:
-            logging.error(f"EXECUTION FAILED: {str(e)}")
+            logger.error(f"EXECUTION FAILED: {str(e)}")
             return f"Error executing Cypher: {str(e)}"
 
 # --- 3. Validate Ontology Tool ---
 
+ONTOLOGY_FILE = "geargraph_ontology.ttl"
+# Optionaler N-Triples-Export der Ontologie; parst deutlich schneller als Turtle
+ONTOLOGY_NT_FILE = "geargraph_ontology.nt"
+
+def _ontology_source():
+    """Returns (path, rdflib format), preferring an N-Triples export that is not older than the TTL."""
+    if os.path.exists(ONTOLOGY_NT_FILE) and (
+        not os.path.exists(ONTOLOGY_FILE)
+        or os.path.getmtime(ONTOLOGY_NT_FILE) >= os.path.getmtime(ONTOLOGY_FILE)
+    ):
+        return ONTOLOGY_NT_FILE, "nt"
+    return ONTOLOGY_FILE, "turtle"
+
+@lru_cache(maxsize=1)
+def _load_ontology(path: str, fmt: str, mtime: float) -> Dict[str, str]:
+    """
+    Parses the ontology once per file version (mtime is part of the cache key)
+    and returns a map of lowercased rdfs:label -> class IRI for every owl:Class.
+    """
+    g = Graph()
+    g.parse(path, format=fmt)
+    classes = set(g.subjects(RDF.type, OWL.Class))
+    return {
+        str(label).lower(): str(cls)
+        for cls, _, label in g.triples((None, RDFS.label, None))
+        if cls in classes
+    }
+
 class ValidateOntologyInput(BaseModel):
     proposed_entity_type: str = Field(..., description="The node label to check (e.g., 'Tent').")
 
@@ -88,29 +184,68 @@ class ValidateOntologyTool(BaseTool):
 
     def _run(self, proposed_entity_type: str) -> str:
         try:
-            g = Graph()
-            if not os.path.exists("geargraph_ontology.ttl"):
-                return "Warning: Ontology file 'geargraph_ontology.ttl' not found. Assuming valid."
+            path, fmt = _ontology_source()
+            if not os.path.exists(path):
+                return f"Warning: Ontology file '{ONTOLOGY_FILE}' not found. Assuming valid."
                 
-            g.parse("geargraph_ontology.ttl", format="turtle")
-            
-            query = f"""
-            SELECT ?subject WHERE {{
-                ?subject a owl:Class ;
-                         rdfs:label ?label .
-                FILTER(LCASE(STR(?label)) = LCASE("{proposed_entity_type}"))
-            }}
-            """
-            res = g.query(query)
-            if len(res) > 0:
-                return f"VALID: '{proposed_entity_type}' exists in ontology."
+            label_index = _load_ontology(path, fmt, os.path.getmtime(path))
+            class_iri = label_index.get(proposed_entity_type.lower())
+            if class_iri:
+                return f"VALID: '{proposed_entity_type}' exists in ontology ({class_iri})."
             else:
                 return f"INVALID: '{proposed_entity_type}' not found in ontology."
         except Exception as e:
             return f"Ontology Check Error: {str(e)}"
 
+# --- Firecrawl Client ---
+
+# Ein FirecrawlApp pro API-Key, geteilt von Extract- und Scrape-Tool
+_FIRECRAWL_APPS: Dict[str, FirecrawlApp] = {}
+
+def _get_firecrawl_app(api_key: str) -> FirecrawlApp:
+    """Returns the shared FirecrawlApp for this API key, creating it on first use."""
+    app = _FIRECRAWL_APPS.get(api_key)
+    if app is None:
+        app = _FIRECRAWL_APPS[api_key] = FirecrawlApp(api_key=api_key)
+    return app
+
+def _require_firecrawl_key() -> str:
+    """Reads FIRECRAWL_API_KEY from the environment or raises a helpful error."""
+    api_key = os.getenv("FIRECRAWL_API_KEY")
+    if not api_key:
+        raise ValueError(
+            "FIRECRAWL_API_KEY not found. "
+            "Please add FIRECRAWL_API_KEY=your-key to the .env file."
+        )
+    return api_key
+
+# Erfolgreiche Extract/Scrape-Ergebnisse pro (URL, Schema); Agents scrapen oft dieselbe Seite erneut
+_firecrawl_cache = _TTLCache(maxsize=256, ttl=24 * 3600)
+
 # --- 4. Firecrawl Extract Tool ---
 
+# Default schema for outdoor gear extraction
+_DEFAULT_GEAR_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "product_name": {"type": "string", "description": "The name of the product"},
+        "brand": {"type": "string", "description": "The manufacturer or brand name"},
+        "weight_grams": {"type": "number", "description": "Product weight in grams"},
+        "weight_ounces": {"type": "number", "description": "Product weight in ounces"},
+        "material": {"type": "string", "description": "Primary material(s) used"},
+        "price_usd": {"type": "number", "description": "Price in USD"},
+        "dimensions": {"type": "string", "description": "Product dimensions"},
+        "product_url": {"type": "string", "description": "Official product URL"},
+        "image_url": {"type": "string", "description": "Product image URL"},
+        "description": {"type": "string", "description": "Product description"},
+        "features": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "List of key features"
+        }
+    }
+}
+
 class FirecrawlExtractInput(BaseModel):
     url: str = Field(..., description="The URL to extract structured data from.")
     schema_dict: Optional[Dict[str, Any]] = Field(
@@ -127,16 +262,17 @@ class FirecrawlExtractTool(BaseTool):
     )
     args_schema: Type[BaseModel] = FirecrawlExtractInput
 
+    _api_key: str = PrivateAttr(default="")
+
     def __init__(self):
         """Initialize Firecrawl with API key from environment."""
         super().__init__()
-        api_key = os.getenv("FIRECRAWL_API_KEY")
-        if not api_key:
-            raise ValueError(
-                "FIRECRAWL_API_KEY not found. "
-                "Please add FIRECRAWL_API_KEY=your-key to the .env file."
-            )
-        object.__setattr__(self, '_firecrawl_app', FirecrawlApp(api_key=api_key))
+        self._api_key = _require_firecrawl_key()
+        _get_firecrawl_app(self._api_key)
+
+    @property
+    def firecrawl_app(self) -> FirecrawlApp:
+        return _get_firecrawl_app(self._api_key)
 
     def _run(self, url: str, schema_dict: Optional[Dict[str, Any]] = None) -> str:
         """
@@ -150,39 +286,26 @@ class FirecrawlExtractTool(BaseTool):
             JSON string with extracted data
         """
         try:
-            app = object.__getattribute__(self, '_firecrawl_app')
+            app = self.firecrawl_app
 
             # Default schema for outdoor gear extraction
             if schema_dict is None:
-                schema_dict = {
-                    "type": "object",
-                    "properties": {
-                        "product_name": {"type": "string", "description": "The name of the product"},
-                        "brand": {"type": "string", "description": "The manufacturer or brand name"},
-                        "weight_grams": {"type": "number", "description": "Product weight in grams"},
-                        "weight_ounces": {"type": "number", "description": "Product weight in ounces"},
-                        "material": {"type": "string", "description": "Primary material(s) used"},
-                        "price_usd": {"type": "number", "description": "Price in USD"},
-                        "dimensions": {"type": "string", "description": "Product dimensions"},
-                        "product_url": {"type": "string", "description": "Official product URL"},
-                        "image_url": {"type": "string", "description": "Product image URL"},
-                        "description": {"type": "string", "description": "Product description"},
-                        "features": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                            "description": "List of key features"
-                        }
-                    }
-                }
+                schema_dict = _DEFAULT_GEAR_SCHEMA
+
+            cache_key = (url, json.dumps(schema_dict, sort_keys=True))
+            cached = _firecrawl_cache.get(cache_key)
+            if cached is not None:
+                return cached
 
             # Use Firecrawl's extract endpoint with correct parameter format
             # Correct API: app.extract(urls=[url], schema=schema_dict)
             result = app.extract(urls=[url], schema=schema_dict)
 
-            import json
             if result and hasattr(result, 'success') and result.success:
                 if hasattr(result, 'data') and result.data:
-                    return f"SUCCESS: Extracted data from {url}\n{json.dumps(result.data, indent=2, default=str)}"
+                    output = f"SUCCESS: Extracted data from {url}\n{json.dumps(result.data, indent=2, default=str)}"
+                    _firecrawl_cache.put(cache_key, output)
+                    return output
                 else:
                     return f"Extraction completed but no data returned from {url}"
             else:
@@ -190,7 +313,7 @@ class FirecrawlExtractTool(BaseTool):
                 return f"Extraction failed for {url}: {error_msg}"
 
         except Exception as e:
-            logging.error(f"Firecrawl extract failed for {url}: {str(e)}")
+            logger.error(f"Firecrawl extract failed for {url}: {str(e)}")
             return f"Error extracting data from {url}: {str(e)}"
 
 # --- 5. Firecrawl Scrape Tool ---
@@ -206,16 +329,17 @@ class FirecrawlScrapeTool(BaseTool):
     )
     args_schema: Type[BaseModel] = FirecrawlScrapeInput
 
+    _api_key: str = PrivateAttr(default="")
+
     def __init__(self):
         """Initialize Firecrawl with API key from environment."""
         super().__init__()
-        api_key = os.getenv("FIRECRAWL_API_KEY")
-        if not api_key:
-            raise ValueError(
-                "FIRECRAWL_API_KEY not found. "
-                "Please add FIRECRAWL_API_KEY=your-key to the .env file."
-            )
-        object.__setattr__(self, '_firecrawl_app', FirecrawlApp(api_key=api_key))
+        self._api_key = _require_firecrawl_key()
+        _get_firecrawl_app(self._api_key)
+
+    @property
+    def firecrawl_app(self) -> FirecrawlApp:
+        return _get_firecrawl_app(self._api_key)
 
     def _run(self, url: str) -> str:
         """
@@ -228,10 +352,16 @@ class FirecrawlScrapeTool(BaseTool):
             Markdown content from the page
         """
         try:
-            app = object.__getattribute__(self, '_firecrawl_app')
+            app = self.firecrawl_app
+            cache_key = (url, "markdown")
+            cached = _firecrawl_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
             result = app.scrape(url=url, formats=['markdown'])
 
             if result and hasattr(result, 'markdown') and result.markdown:
+                _firecrawl_cache.put(cache_key, result.markdown)
                 return result.markdown
             else:
                 return f"Error: No markdown content found for {url}"